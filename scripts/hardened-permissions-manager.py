@@ -6,28 +6,45 @@ Implements XML-based permissions, CHMOD/CHOWN hardening, PGP integration
 with living code wrappers for maximum security
 """
 
+import io
 import os
+import errno
+import re
 import sys
 import stat
+import fnmatch
 import pwd
 import grp
 import xml.etree.ElementTree as ET
 import hashlib
 import subprocess
 import json
+import shutil
+import sqlite3
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# Shell wrapper installed by --pgp, shipped alongside this script
+PGP_WRAPPER_TEMPLATE = Path(__file__).resolve().parent / "data" / "pgp-security-wrapper.sh.tmpl"
+
 class HardenedPermissionsManager:
     """Comprehensive permissions management with XML definitions and PGP integration"""
     
+    # Directories no permission set targets; never descended into
+    PRUNED_DIRS = frozenset({".git", ".venv", "node_modules", "build", ".gradle"})
+    
     def __init__(self, repo_root: str):
         self.repo_root = Path(repo_root)
         self.permissions_db = self.repo_root / ".hardened_permissions.db"
         self.xml_config = self.repo_root / "configs" / "permissions.xml"
         self.pgp_keyring = self.repo_root / ".pgp_keyring"
         self.living_code_wrapper = self.repo_root / ".living_environment_wrapper.sh"
+        self._config_cache: Optional[ET.Element] = None
+        self._config_mtime: Optional[int] = None
+        self._matchers: Optional[List[Tuple[re.Pattern, Tuple[str, str, str, str]]]] = None
+        self._file_set_map: Dict[Path, Dict[Path, Tuple[str, str, str, str]]] = {}
         
         # Ensure directories exist
         self.xml_config.parent.mkdir(exist_ok=True)
@@ -89,14 +106,54 @@ class HardenedPermissionsManager:
             tree.write(self.xml_config, encoding='utf-8', xml_declaration=True)
             
     def load_permissions_config(self) -> ET.Element:
-        """Load permissions configuration from XML"""
+        """Load permissions configuration from XML (re-parsed only when the file changes)"""
+        mtime = self.xml_config.stat().st_mtime_ns
+        if self._config_cache is not None and mtime == self._config_mtime:
+            return self._config_cache
+        try:
+            self._config_cache = ET.parse(self.xml_config).getroot()
+            self._config_mtime = mtime
+            self._matchers = None
+            self._file_set_map.clear()
+            return self._config_cache
+        except ET.ParseError as e:
+            print(f"Error parsing XML config: {e}")
+            sys.exit(1)
+            
+    def _stream_permissions_config(self):
+        """Yield (event, element) pairs from the XML config without building the full tree"""
         try:
-            tree = ET.parse(self.xml_config)
-            return tree.getroot()
+            yield from ET.iterparse(self.xml_config, events=("start", "end"))
         except ET.ParseError as e:
             print(f"Error parsing XML config: {e}")
             sys.exit(1)
             
+    def _iter_config_sections(self):
+        """Yield the config root, then each of its top-level elements
+        
+        Reuses the tree load_permissions_config already parsed when it is
+        still current (e.g. --apply --report in one run); otherwise streams
+        the file so only the section being read is held in memory.
+        """
+        mtime = self.xml_config.stat().st_mtime_ns
+        if self._config_cache is not None and mtime == self._config_mtime:
+            yield self._config_cache
+            yield from self._config_cache
+            return
+        
+        events = self._stream_permissions_config()
+        _, root = next(events)
+        yield root
+        depth = 1
+        for event, elem in events:
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                yield elem
+                elem.clear()
+            
     def apply_hardened_permissions(self, target_path: Optional[str] = None) -> bool:
         """Apply hardened permissions based on XML configuration"""
         print("🔒 Applying hardened permissions with living code integration...")
@@ -108,32 +165,13 @@ class HardenedPermissionsManager:
         applied_perms = []
         
         try:
-            # Apply permission sets
-            for perm_set in config.findall("permission_set"):
-                name = perm_set.get("name")
-                permissions = perm_set.get("permissions")
-                owner = perm_set.get("owner")
-                group = perm_set.get("group")
-                
-                patterns_elem = perm_set.find("patterns")
-                if patterns_elem is not None:
-                    patterns = [p.text for p in patterns_elem.findall("pattern")]
-                    
-                    for pattern in patterns:
-                        files_found = list(target.rglob(pattern))
-                        for file_path in files_found:
-                            if file_path.exists():
-                                result = self._apply_file_permissions(
-                                    file_path, permissions, owner, group
-                                )
-                                if result:
-                                    applied_perms.append({
-                                        "file": str(file_path),
-                                        "permissions": permissions,
-                                        "owner": owner,
-                                        "group": group,
-                                        "set": name
-                                    })
+            # Apply permission sets; chmod/chown spend their time in the kernel,
+            # so fan the per-file work out across a thread pool
+            work_items = self._collect_permission_targets(target)
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(self._apply_work_item, work_items.items())
+                applied_perms.extend(record for record in results if record)
             
             # Apply living code wrapper permissions
             living_code = config.find("living_code")
@@ -173,23 +211,113 @@ class HardenedPermissionsManager:
             print(f"❌ Error applying permissions: {e}")
             return False
     
+    def _permission_matchers(self) -> List[Tuple[re.Pattern, Tuple[str, str, str, str]]]:
+        """Compiled filename matcher and (set, permissions, owner, group) per permission set"""
+        config = self.load_permissions_config()
+        if self._matchers is not None:
+            return self._matchers
+        
+        matchers = []
+        for perm_set in config.findall("permission_set"):
+            patterns_elem = perm_set.find("patterns")
+            if patterns_elem is None:
+                continue
+            
+            patterns = [p.text for p in patterns_elem.findall("pattern")]
+            if not patterns:
+                continue
+            matcher = re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+            spec = (perm_set.get("name"), perm_set.get("permissions"),
+                    perm_set.get("owner"), perm_set.get("group"))
+            matchers.append((matcher, spec))
+        
+        self._matchers = matchers
+        return matchers
+    
+    def _collect_permission_targets(self, target: Path) -> Dict[Path, Tuple[str, str, str, str]]:
+        """Map every matched file to the (set, permissions, owner, group) it receives.
+        
+        Later permission sets win when a file matches several of them, so each
+        file is touched exactly once regardless of how many patterns hit it.
+        The mapping is memoized per target until the XML config changes.
+        """
+        matchers = self._permission_matchers()[::-1]
+        if target in self._file_set_map:
+            return self._file_set_map[target]
+        
+        targets = {}
+        # Never follow directory symlinks: avoids cycles and duplicate yields
+        for dirpath, dirnames, filenames in os.walk(target, followlinks=False):
+            dirnames[:] = [d for d in dirnames if d not in self.PRUNED_DIRS]
+            for name in dirnames + filenames:
+                for matcher, spec in matchers:
+                    if matcher.match(name):
+                        # Skip dangling symlinks, as the old exists() filter did
+                        path = os.path.join(dirpath, name)
+                        if os.path.exists(path):
+                            targets[Path(path)] = spec
+                        break
+        
+        self._file_set_map[target] = targets
+        return targets
+    
+    def _apply_work_item(self, item: Tuple[Path, Tuple[str, str, str, str]]) -> Optional[Dict]:
+        """Apply one collected permission target, returning its database record"""
+        file_path, (name, permissions, owner, group) = item
+        if not self._apply_file_permissions(file_path, permissions, owner, group):
+            return None
+        return {
+            "file": str(file_path),
+            "permissions": permissions,
+            "owner": owner,
+            "group": group,
+            "set": name
+        }
+    
+    @staticmethod
+    def _open_for_metadata(file_path: Path) -> int:
+        """Open a descriptor for fchmod/fchown, resolving a symlink at most once"""
+        flags = os.O_RDONLY | os.O_NOFOLLOW | os.O_NONBLOCK | os.O_CLOEXEC
+        try:
+            return os.open(file_path, flags)
+        except OSError as e:
+            if e.errno != errno.ELOOP:
+                raise
+        # Symlink: act on its resolved target, as chmod(2) would
+        return os.open(os.path.realpath(file_path), flags)
+    
     def _apply_file_permissions(self, file_path: Path, permissions: str, owner: str, group: str) -> bool:
         """Apply specific permissions to a file"""
         try:
             # Convert octal string to integer
             mode = int(permissions, 8)
             
-            # Apply chmod
-            os.chmod(file_path, mode)
+            # Work through a descriptor so the path is only resolved once;
+            # files we cannot open (unreadable, sockets, device nodes) are still
+            # chmod'ed by path. A symlink loop fails either way, so report it.
+            try:
+                fd = self._open_for_metadata(file_path)
+            except OSError as e:
+                if e.errno == errno.ELOOP:
+                    raise
+                fd = None
+            handle = fd if fd is not None else file_path
             
-            # Apply chown (if running as root or if user/group match current)
             try:
-                uid = pwd.getpwnam(owner).pw_uid if owner != "user" else os.getuid()
-                gid = grp.getgrnam(group).gr_gid if group != "user" else os.getgid()
-                os.chown(file_path, uid, gid)
-            except (KeyError, PermissionError):
-                # Skip chown if user/group doesn't exist or no permission
-                pass
+                # Apply chmod
+                os.chmod(handle, mode)
+                
+                # Apply chown (if running as root or if user/group match current)
+                try:
+                    uid = pwd.getpwnam(owner).pw_uid if owner != "user" else os.getuid()
+                    gid = grp.getgrnam(group).gr_gid if group != "user" else os.getgid()
+                    os.chown(handle, uid, gid)
+                except (KeyError, PermissionError):
+                    # Skip chown if user/group doesn't exist or no permission
+                    pass
+            finally:
+                if fd is not None:
+                    os.close(fd)
                 
             return True
             
@@ -197,18 +325,65 @@ class HardenedPermissionsManager:
             print(f"Warning: Could not apply permissions to {file_path}: {e}")
             return False
     
+    def _connect_permissions_db(self) -> sqlite3.Connection:
+        """Open the permissions database, creating its schema if needed"""
+        conn = sqlite3.connect(self.permissions_db)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("""CREATE TABLE IF NOT EXISTS perms(
+                path TEXT PRIMARY KEY,
+                mode TEXT,
+                owner TEXT,
+                grp TEXT,
+                set_name TEXT
+            )""")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta(key TEXT PRIMARY KEY, value TEXT)")
+        except sqlite3.DatabaseError:
+            # e.g. a legacy JSON file: release the handle before callers replace it
+            conn.close()
+            raise
+        return conn
+    
+    def _open_permissions_db_readonly(self) -> sqlite3.Connection:
+        """Open the permissions database read-only, without touching its schema or journal mode"""
+        conn = sqlite3.connect(f"{self.permissions_db.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            # Opening is lazy; a legacy JSON file only fails on first read
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+    
     def _save_permissions_db(self, applied_perms: List[Dict]):
         """Save applied permissions to database"""
-        db_data = {
+        try:
+            conn = self._connect_permissions_db()
+        except sqlite3.DatabaseError:
+            # Older releases wrote this file as a JSON blob; replace it
+            self.permissions_db.unlink()
+            conn = self._connect_permissions_db()
+        
+        meta = {
             "timestamp": int(time.time()),
-            "applied_permissions": applied_perms,
             "total_files": len(applied_perms),
             "security_level": "maximum",
             "living_code_integrated": True
         }
         
-        with open(self.permissions_db, 'w') as f:
-            json.dump(db_data, f, indent=2)
+        try:
+            with conn:
+                conn.execute("DELETE FROM perms")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO perms VALUES (?,?,?,?,?)",
+                    ((p["file"], p["permissions"], p["owner"], p["group"], p["set"]) for p in applied_perms)
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO meta VALUES (?,?)",
+                    ((key, json.dumps(value)) for key, value in meta.items())
+                )
+        finally:
+            conn.close()
     
     def verify_permissions(self) -> bool:
         """Verify all permissions are correctly applied"""
@@ -219,27 +394,33 @@ class HardenedPermissionsManager:
             return False
             
         try:
-            with open(self.permissions_db, 'r') as f:
-                db_data = json.load(f)
-                
+            conn = self._open_permissions_db_readonly()
+        except sqlite3.DatabaseError:
+            print(f"❌ {self.permissions_db} is a legacy (pre-sqlite) database; re-run --apply to migrate it")
+            return False
+            
+        try:
             verified = 0
             failed = 0
             
-            for perm in db_data["applied_permissions"]:
-                file_path = Path(perm["file"])
-                expected_mode = int(perm["permissions"], 8)
+            for file_path, permissions in conn.execute("SELECT path, mode FROM perms"):
+                expected_mode = int(permissions, 8)
                 
-                if file_path.exists():
-                    actual_mode = stat.S_IMODE(file_path.stat().st_mode)
-                    if actual_mode == expected_mode:
-                        verified += 1
-                    else:
-                        failed += 1
-                        print(f"⚠️  Permission mismatch: {file_path}")
-                        print(f"   Expected: {oct(expected_mode)}, Actual: {oct(actual_mode)}")
-                else:
+                # A single stat both checks existence and yields the mode
+                try:
+                    st = os.stat(file_path)
+                except FileNotFoundError:
                     failed += 1
                     print(f"⚠️  File not found: {file_path}")
+                    continue
+                
+                actual_mode = stat.S_IMODE(st.st_mode)
+                if actual_mode == expected_mode:
+                    verified += 1
+                else:
+                    failed += 1
+                    print(f"⚠️  Permission mismatch: {file_path}")
+                    print(f"   Expected: {oct(expected_mode)}, Actual: {oct(actual_mode)}")
             
             print(f"✅ Verified: {verified} files")
             if failed > 0:
@@ -250,6 +431,8 @@ class HardenedPermissionsManager:
         except Exception as e:
             print(f"❌ Error verifying permissions: {e}")
             return False
+        finally:
+            conn.close()
     
     def generate_pgp_integration(self) -> bool:
         """Generate PGP integration for enhanced security"""
@@ -274,51 +457,7 @@ class HardenedPermissionsManager:
             
             # Create PGP wrapper script
             pgp_wrapper = self.repo_root / "scripts" / "pgp-security-wrapper.sh"
-            pgp_wrapper_content = '''#!/bin/bash
-# PGP Security Wrapper - Living Code Integration
-# Provides cryptographic security for living code environment
-
-export PGP_ENABLED=1
-export PGP_KEYRING="$(pwd)/.pgp_keyring"
-
-# PGP operations for living code
-living_code_sign() {
-    local file="$1"
-    if [[ -f "$file" && "$PGP_ENABLED" == "1" ]]; then
-        echo "🔐 Signing $file with PGP..."
-        # GPG signing would go here in production
-        echo "$(date -Iseconds): $file signed" >> "$PGP_KEYRING/signature_log"
-    fi
-}
-
-living_code_verify() {
-    local file="$1"
-    if [[ -f "$file" && "$PGP_ENABLED" == "1" ]]; then
-        echo "🔍 Verifying PGP signature for $file..."
-        # GPG verification would go here in production
-        return 0
-    fi
-    return 1
-}
-
-# Auto-sign critical living code files
-auto_sign_living_code() {
-    local living_wrapper="$(pwd)/.living_environment_wrapper.sh"
-    local living_db="$(pwd)/.living_environment.db"
-    
-    [[ -f "$living_wrapper" ]] && living_code_sign "$living_wrapper"
-    [[ -f "$living_db" ]] && living_code_sign "$living_db"
-}
-
-# Export functions
-export -f living_code_sign living_code_verify auto_sign_living_code
-
-# Auto-sign on source
-auto_sign_living_code
-'''
-            
-            with open(pgp_wrapper, 'w') as f:
-                f.write(pgp_wrapper_content)
+            shutil.copyfile(PGP_WRAPPER_TEMPLATE, pgp_wrapper)
             
             os.chmod(pgp_wrapper, 0o755)
             
@@ -333,9 +472,11 @@ auto_sign_living_code
         """Create comprehensive security report"""
         report_path = self.repo_root / "HARDENED_SECURITY_REPORT.md"
         
-        config = self.load_permissions_config()
+        sections_iter = self._iter_config_sections()
+        config = next(sections_iter)
         
-        report_content = f"""# Hardened Security Report - Living Code Integration
+        buf = io.StringIO()
+        buf.write(f"""# Hardened Security Report - Living Code Integration
 
 ## 🔒 Security Configuration Status
 
@@ -350,21 +491,25 @@ auto_sign_living_code
 **Version:** {config.get('version', 'Unknown')}
 
 ### Permission Sets Configured:
-"""
+""")
         
-        for perm_set in config.findall("permission_set"):
-            name = perm_set.get("name")
-            permissions = perm_set.get("permissions")
-            owner = perm_set.get("owner")
-            group = perm_set.get("group")
-            
-            report_content += f"""
-- **{name}**: {permissions} ({owner}:{group})"""
+        sections = {}
+        for elem in sections_iter:
+            if elem.tag == "permission_set":
+                name = elem.get("name")
+                permissions = elem.get("permissions")
+                owner = elem.get("owner")
+                group = elem.get("group")
+                
+                buf.write(f"""
+- **{name}**: {permissions} ({owner}:{group})""")
+            else:
+                sections.setdefault(elem.tag, dict(elem.attrib))
         
         # Living code security
-        living_code = config.find("living_code")
+        living_code = sections.get("living_code")
         if living_code is not None:
-            report_content += f"""
+            buf.write(f"""
 
 ## 🧬 Living Code Security
 
@@ -372,12 +517,12 @@ auto_sign_living_code
 **Wrapper Permissions:** {living_code.get('wrapper_permissions', 'Not set')}
 **Database Permissions:** {living_code.get('db_permissions', 'Not set')}
 **Security Level:** {living_code.get('security_level', 'Standard')}
-"""
+""")
         
         # Container security
-        container = config.find("container")
+        container = sections.get("container")
         if container is not None:
-            report_content += f"""
+            buf.write(f"""
 
 ## 📦 Container Security
 
@@ -385,24 +530,24 @@ auto_sign_living_code
 **TOYBOX Permissions:** {container.get('toybox_permissions', 'Not set')}
 **Chroot Permissions:** {container.get('chroot_permissions', 'Not set')}
 **Isolation Level:** {container.get('isolation_level', 'Standard')}
-"""
+""")
         
         # Android-specific
-        android = config.find("android")
+        android = sections.get("android")
         if android is not None:
-            report_content += f"""
+            buf.write(f"""
 
 ## 🤖 Android Security
 
 **Minimum Version:** Android {android.get('min_version', 'Unknown')}
 **Container Required:** {'✅ Yes' if android.get('container_required') == 'true' else '❌ No'}
 **Execution Mode:** {android.get('execution_mode', 'Standard')}
-"""
+""")
         
         # PGP integration status
         pgp_config_file = self.repo_root / "configs" / "pgp_security.json"
         if pgp_config_file.exists():
-            report_content += """
+            buf.write("""
 
 ## 🔐 PGP Integration
 
@@ -410,9 +555,9 @@ auto_sign_living_code
 **Keyring:** `.pgp_keyring/`
 **Living Code Signing:** ✅ Enabled
 **Critical File Encryption:** ✅ Enabled
-"""
+""")
         
-        report_content += f"""
+        buf.write(f"""
 
 ## 📊 Security Metrics
 
@@ -443,10 +588,10 @@ python3 scripts/hardened-permissions-manager.py --verify
 # Generate security report
 python3 scripts/hardened-permissions-manager.py --report
 ```
-"""
+""")
         
         with open(report_path, 'w') as f:
-            f.write(report_content)
+            f.write(buf.getvalue())
             
         return str(report_path)
 
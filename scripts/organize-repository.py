@@ -18,13 +18,22 @@ References:
 """
 
 import os
+import re
+import errno
 import shutil
-import glob
+import fnmatch
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 import json
 
+try:
+    import orjson  # optional C encoder for the JSON organization log
+except ImportError:
+    orjson = None
+
 # Configure logging for LDU (Linear Development Updates) tracking
 logging.basicConfig(
     level=logging.INFO,
@@ -32,9 +41,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Change to the repository directory
+# Repository directory the organizer runs in
 repo_dir = "/home/runner/work/DevUtilityV2-InnovativeToolchestAI/DevUtilityV2-InnovativeToolchestAI"
-os.chdir(repo_dir)
 
 # Define DevUtility agentic standards file organization (@UFUIC-O)
 file_moves = {
@@ -190,60 +198,203 @@ file_moves = {
     ]
 }
 
-def safe_move(src_pattern, dest_dir):
-    """@PIPI Safely move files matching pattern to destination directory with validation"""
-    try:
-        # Ensure destination directory exists
+# A pattern ending in a literal ".ext" can only match names with that extension
+_FIXED_EXT_RE = re.compile(r'\.[A-Za-z0-9_-]+$')
+
+def _compile_branches(entries):
+    """@PIPI One alternation with a named group per destination, in priority order"""
+    if not entries:
+        return re.compile(r'(?!)')
+    grouped = {}
+    for group, pattern, _ in entries:
+        grouped.setdefault(group, []).append(f"(?:{fnmatch.translate(pattern)})")
+    return re.compile("|".join(f"(?P<{group}>{'|'.join(branches)})" for group, branches in grouped.items()))
+
+def compile_file_moves(moves):
+    """@PIPI Compile the move table into per-extension matchers
+    
+    Each pattern with a fixed extension is only tried against names carrying
+    that extension; the remaining patterns are tried against every name.
+    Within a matcher the alternation is tried left to right, so the first
+    destination (and pattern) listed in ``moves`` still wins when several
+    would match the same file.
+    """
+    destinations = {}
+    entries = []
+    for index, (dest_dir, patterns) in enumerate(moves.items()):
+        group = f"d{index}"
+        destinations[group] = dest_dir
+        for pattern in patterns:
+            ext = _FIXED_EXT_RE.search(pattern)
+            entries.append((group, pattern, ext.group() if ext else None))
+    
+    extensions = {ext for _, _, ext in entries if ext}
+    by_ext = {
+        ext: _compile_branches([e for e in entries if e[2] in (ext, None)])
+        for ext in extensions
+    }
+    generic = _compile_branches([e for e in entries if e[2] is None])
+    return (by_ext, generic), destinations
+
+# @PIPI Translate and compile the move table once, at import
+FILE_MOVE_MATCHERS, FILE_MOVE_DESTINATIONS = compile_file_moves(file_moves)
+
+def plan_moves(matchers, destinations, root="."):
+    """@PIPI Scan the root directory once and bucket each matching file under its destination"""
+    by_ext, generic = matchers
+    planned = {dest_dir: [] for dest_dir in destinations.values()}
+    
+    with os.scandir(root) as entries:
+        for entry in entries:
+            # glob() never matched dot-files, keep it that way
+            if entry.name.startswith('.'):
+                continue
+            # Match the name first: is_file() is answered from the cached
+            # d_type for regular files and only stats symlinks, so only
+            # candidates that would actually move can cost a syscall
+            matcher = by_ext.get(os.path.splitext(entry.name)[1], generic)
+            match = matcher.match(entry.name)
+            if match and entry.is_file():
+                planned[destinations[match.lastgroup]].append(entry.path)
+    
+    return planned
+
+# Directories already created during this run
+_created_dirs = set()
+
+def ensure_dir(dest_dir):
+    """@PIPI Create dest_dir once per run instead of re-stat'ing it for every file"""
+    if dest_dir not in _created_dirs:
         os.makedirs(dest_dir, exist_ok=True)
+        _created_dirs.add(dest_dir)
+
+# Names known to exist in each destination directory, filled by one scandir
+_dest_index = {}
+
+def destination_names(dest_dir):
+    """@LDU In-memory index of the entries in dest_dir, scanned on first use"""
+    names = _dest_index.get(dest_dir)
+    if names is None:
+        with os.scandir(dest_dir) as entries:
+            names = {entry.name for entry in entries}
+        _dest_index[dest_dir] = names
+    return names
+
+def reserve_destination(dest_dir, filename):
+    """@LDU Claim a free name in dest_dir, adding a number on conflicts
+    
+    Reservation is purely in-memory against the scanned directory index, so an
+    interrupted run never leaves placeholder files behind.
+    """
+    existing = destination_names(dest_dir)
+    name, ext = os.path.splitext(filename)
+    candidate = filename
+    counter = 1
+    while candidate in existing:
+        candidate = f"{name}_{counter}{ext}"
+        counter += 1
+    existing.add(candidate)
+    return os.path.join(dest_dir, candidate)
+
+def reserve_moves(planned):
+    """@LDU Claim every destination name up front so parallel moves never race on conflict numbering"""
+    reserved = {}
+    for dest_dir, file_paths in planned.items():
+        moves = []
+        reserved[dest_dir] = moves
+        try:
+            # Ensure destination directory exists, even when nothing moves into it
+            ensure_dir(dest_dir)
+        except Exception as e:
+            logger.error(f"@PIPI ERROR creating {dest_dir}: {e}")
+            continue
         
-        # Find files matching the pattern
-        files = glob.glob(src_pattern)
-        moved_count = 0
-        
-        for file_path in files:
-            if os.path.isfile(file_path):
-                filename = os.path.basename(file_path)
-                dest_path = os.path.join(dest_dir, filename)
-                
+        for file_path in file_paths:
+            try:
                 # @LDU Handle filename conflicts by adding a number
-                counter = 1
-                original_dest = dest_path
-                while os.path.exists(dest_path):
-                    name, ext = os.path.splitext(original_dest)
-                    dest_path = f"{name}_{counter}{ext}"
-                    counter += 1
-                
-                # @PIPI Execute move with logging
-                shutil.move(file_path, dest_path)
-                logger.info(f"@LDU MOVED: {file_path} -> {dest_path}")
-                moved_count += 1
-                
-        return moved_count
+                moves.append((file_path, reserve_destination(dest_dir, os.path.basename(file_path))))
+            except Exception as e:
+                logger.error(f"@PIPI ERROR moving {file_path} to {dest_dir}: {e}")
+    return reserved
+
+def safe_move(move, dest_dir):
+    """@PIPI Safely move a single file onto its reserved destination path with validation
+    
+    Returns the move record on success, None on failure.
+    """
+    file_path, dest_path = move
+    try:
+        # @PIPI Execute move with logging; rename(2) onto the reserved name,
+        # falling back to a copy only across filesystems
+        try:
+            os.rename(file_path, dest_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(file_path, dest_path)
+        # @LDU Recorded in logs/moves.ndjson rather than logged one by one
+        return {"src": file_path, "dst": dest_path}
         
     except Exception as e:
-        logger.error(f"@PIPI ERROR moving {src_pattern} to {dest_dir}: {e}")
-        return 0
+        logger.error(f"@PIPI ERROR moving {file_path} to {dest_dir}: {e}")
+        if os.path.exists(file_path):
+            # Nothing landed there: release the reserved name
+            destination_names(dest_dir).discard(os.path.basename(dest_path))
+        return None
 
 def create_directory_index(directory, title):
     """@GATT Create navigation index for directories"""
     index_path = os.path.join(directory, "INDEX.md")
     
-    with open(index_path, 'w') as f:
-        f.write(f"# {title}\n")
-        f.write("<!-- @GATT Guided-AI-Tutorial-Tips Navigation -->\n\n")
-        
-        # List files in directory
-        files = [f for f in os.listdir(directory) if os.path.isfile(os.path.join(directory, f)) and f != "INDEX.md"]
-        
-        if files:
-            f.write("## Contents (@EG Easy-to-Grasp)\n\n")
-            for file in sorted(files):
-                f.write(f"- [{file}]({file})\n")
-        
-        f.write(f"\n---\n*Generated following DevUtility agentic standards: @GDA @UFUIC-O @PIPI @LDU @EG @GATT @SWT*\n")
+    # List files in directory
+    with os.scandir(directory) as entries:
+        files = sorted(e.name for e in entries if e.is_file() and e.name != "INDEX.md")
+    
+    parts = [
+        f"# {title}\n",
+        "<!-- @GATT Guided-AI-Tutorial-Tips Navigation -->\n\n",
+    ]
+    if files:
+        parts.append("## Contents (@EG Easy-to-Grasp)\n\n")
+        parts.extend(f"- [{file}]({file})\n" for file in files)
+    parts.append("\n---\n*Generated following DevUtility agentic standards: @GDA @UFUIC-O @PIPI @LDU @EG @GATT @SWT*\n")
+    
+    with open(index_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write("".join(parts))
     
     logger.info(f"@GATT Created index for {directory}")
 
+def show_structure(path, depth=0, max_depth=2):
+    """@SWT Print the directory tree down to max_depth without scanning anything deeper"""
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    dirs = []
+    files = []
+    for entry in entries:
+        (dirs if entry.is_dir() else files).append(entry)
+    
+    indent = " " * 2 * depth
+    print(f"{indent}{os.path.basename(path)}/")
+    subindent = " " * 2 * (depth + 1)
+    for entry in files[:3]:  # Show first 3 files per directory
+        print(f"{subindent}{entry.name}")
+    if len(files) > 3:
+        print(f"{subindent}... and {len(files) - 3} more files")
+    
+    if depth >= max_depth:
+        return
+    for entry in dirs:
+        # Skip hidden directories, build artifacts and directory symlinks
+        if entry.name.startswith('.') or entry.name in ('build', 'node_modules'):
+            continue
+        if entry.is_symlink():
+            continue
+        show_structure(entry.path, depth + 1, max_depth)
+
 def validate_critical_systems():
     """@PIPI Validate that critical systems remain functional after organization"""
     logger.info("@PIPI Validating critical systems...")
@@ -271,49 +422,8 @@ def validate_critical_systems():
     
     return validation_passed
 
-# @GDA Execute the file organization following agentic standards
-logger.info("@GDA Starting DevUtility repository organization")
-logger.info("@PIPI Phase 1: Preview and validate planned moves")
-
-total_moved = 0
-organization_log = {
-    "timestamp": datetime.now().isoformat(),
-    "moves": {},
-    "standards_applied": ["GDA", "UFUIC-O", "PIPI", "LDU", "EG", "GATT", "SWT"]
-}
-
-for dest_dir, patterns in file_moves.items():
-    logger.info(f"@GDA Processing directory: {dest_dir}")
-    dir_moved = 0
-    
-    for pattern in patterns:
-        count = safe_move(pattern, dest_dir)
-        dir_moved += count
-        total_moved += count
-    
-    organization_log["moves"][dest_dir] = dir_moved
-    
-    # @GATT Create index files for organized directories
-    if dir_moved > 0 and os.path.exists(dest_dir):
-        create_directory_index(dest_dir, f"DevUtility {os.path.basename(dest_dir).title()}")
-
-logger.info(f"@LDU Total files organized: {total_moved}")
-
-# @PIPI Phase 2: Validate organization 
-validation_passed = validate_critical_systems()
-
-if validation_passed:
-    logger.info("@PIPI Organization validation PASSED")
-else:
-    logger.error("@PIPI Organization validation FAILED")
-
-# @LDU Save organization log
-os.makedirs("logs", exist_ok=True)
-with open("logs/organization_log.json", 'w') as f:
-    json.dump(organization_log, f, indent=2)
-
-# Create main repository index (@GATT)
-main_index_content = """# DevUtility Repository Index
+# @GATT Main repository index, filled in with the run totals
+MAIN_INDEX_TEMPLATE = """# DevUtility Repository Index
 <!-- @GATT Guided-AI-Tutorial-Tips Navigation -->
 
 ## Quick Navigation (@EG Easy-to-Grasp)
@@ -344,34 +454,98 @@ main_index_content = """# DevUtility Repository Index
 4. Configuration files are categorized in `configs/`
 
 ## Organization Log
-- Total files organized: """ + str(total_moved) + """
-- Organization completed: """ + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + """
+- Total files organized: {total_moved}
+- Organization completed: {run_time:%Y-%m-%d %H:%M:%S}
 - Standards applied: @GDA @UFUIC-O @PIPI @LDU @EG @GATT @SWT
 
 ---
 *Generated following DevUtility agentic standards: @GDA @UFUIC-O @PIPI @LDU @EG @GATT @SWT*
 """
 
-with open("INDEX.md", 'w') as f:
-    f.write(main_index_content)
+def main():
+    """@GDA Execute the file organization following agentic standards"""
+    os.chdir(repo_dir)
+    
+    logger.info("@GDA Starting DevUtility repository organization")
+    logger.info("@PIPI Phase 1: Preview and validate planned moves")
+
+    # @LDU One timestamp for the whole run, shared by the JSON log and INDEX.md
+    run_time = datetime.now()
 
-logger.info("@GATT Created main repository index")
+    total_moved = 0
+    moves_log = []
+    organization_log = {
+        "timestamp": run_time.isoformat(),
+        "moves": {},
+        "standards_applied": ["GDA", "UFUIC-O", "PIPI", "LDU", "EG", "GATT", "SWT"]
+    }
 
-# @SWT Display the resulting structure
-logger.info("@SWT Repository structure after organization:")
-for root, dirs, files in os.walk("."):
-    # Skip hidden directories and build artifacts
-    dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['build', 'node_modules']]
-    
-    level = root.replace(".", "").count(os.sep)
-    if level <= 2:  # Only show first 2 levels
-        indent = " " * 2 * level
-        print(f"{indent}{os.path.basename(root)}/")
-        subindent = " " * 2 * (level + 1)
-        for file in files[:3]:  # Show first 3 files per directory
-            print(f"{subindent}{file}")
-        if len(files) > 3:
-            print(f"{subindent}... and {len(files) - 3} more files")
-
-logger.info("@GDA DevUtility repository organization complete!")
-logger.info("@GATT Check INDEX.md for navigation guide")
\ No newline at end of file
+    planned_moves = plan_moves(FILE_MOVE_MATCHERS, FILE_MOVE_DESTINATIONS)
+
+    reserved_moves = reserve_moves(planned_moves)
+
+    # @PIPI Names are reserved, so the moves are independent: overlap the rename syscalls
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        move_results = {
+            dest_dir: executor.map(partial(safe_move, dest_dir=dest_dir), moves)
+            for dest_dir, moves in reserved_moves.items()
+        }
+
+        for dest_dir, results in move_results.items():
+            logger.info(f"@GDA Processing directory: {dest_dir}")
+            dir_moves = [record for record in results if record]
+            dir_moved = len(dir_moves)
+            total_moved += dir_moved
+            moves_log.extend(dir_moves)
+            logger.info(f"@LDU MOVED: {dir_moved} files -> {dest_dir}")
+
+            organization_log["moves"][dest_dir] = dir_moved
+
+            # @GATT Create index files for organized directories; a successful
+            # move already proves dest_dir exists, so no stat is needed here
+            if dir_moved > 0:
+                create_directory_index(dest_dir, f"DevUtility {os.path.basename(dest_dir).title()}")
+
+    logger.info(f"@LDU Total files organized: {total_moved}")
+
+    # @PIPI Phase 2: Validate organization 
+    validation_passed = validate_critical_systems()
+
+    if validation_passed:
+        logger.info("@PIPI Organization validation PASSED")
+    else:
+        logger.error("@PIPI Organization validation FAILED")
+
+    # @LDU Nothing moved (the usual re-run): the logs, indexes and tree are already current
+    if total_moved == 0:
+        logger.info("@LDU Repository already organized; skipping log, index and tree regeneration")
+        return
+
+    # @LDU Save organization log
+    ensure_dir("logs")
+    if orjson is not None:
+        with open("logs/organization_log.json", 'wb') as f:
+            f.write(orjson.dumps(organization_log, option=orjson.OPT_INDENT_2))
+    else:
+        with open("logs/organization_log.json", 'w', encoding='utf-8', newline='\n') as f:
+            json.dump(organization_log, f, indent=2)
+    with open("logs/moves.ndjson", 'w', encoding='utf-8', newline='\n') as f:
+        f.writelines(json.dumps(record) + "\n" for record in moves_log)
+
+    # Create main repository index (@GATT)
+    main_index_content = MAIN_INDEX_TEMPLATE.format(total_moved=total_moved, run_time=run_time)
+
+    with open("INDEX.md", 'w', encoding='utf-8', newline='\n') as f:
+        f.write(main_index_content)
+
+    logger.info("@GATT Created main repository index")
+
+    # @SWT Display the resulting structure
+    logger.info("@SWT Repository structure after organization:")
+    show_structure(".")
+
+    logger.info("@GDA DevUtility repository organization complete!")
+    logger.info("@GATT Check INDEX.md for navigation guide")
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ Behavior:
 - For "ollama pull ..." command lines, preserves the original line and inserts HF alternatives
   as a commented line right after (so semantics remain visible).
 - Preserves any tag suffix (e.g. :tag) by appending it to the HF form (user can adjust later).
-- Works as dry-run by default; use --apply to write files.
+- Works as dry-run by default; use --apply to write files (--backup keeps a .bak copy).
 - Skips .git directory and common binary files.
 
 Usage:
@@ -17,35 +17,46 @@ Usage:
 
 from __future__ import annotations
 import argparse
+import mmap
+import os
 import re
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import List, Tuple
 
 # Patterns to find (case-insensitive where appropriate)
 # The group 'model' captures timidlly/unified-v1 and optional tag in group 'tag'
-URL_OLLAMA_RE = re.compile(
-    r"https?://(?:www\.)?ollama\.com/(?P<model>timidlly/unified-v1)(?P<tag>:[^\s'\")]+)?",
-    flags=re.IGNORECASE,
-)
-OLLAMA_SCHEME_RE = re.compile(
-    r"(?P<prefix>\b)ollama://(?P<model>timidlly/unified-v1)(?P<tag>:[^\s'\"`]+)?",
-    flags=re.IGNORECASE,
-)
-OLLAMA_COLON_RE = re.compile(
-    r"(?P<prefix>\b)ollama:(?P<model>timidlly/unified-v1)(?P<tag>:[^\s'\"`]+)?",
+# All three inline forms share one pass; the named prefix group tells them apart.
+# URL tags stop at ')' while the ollama:// and ollama: tags stop at a backtick.
+OLLAMA_REF_RE = re.compile(
+    r"(?:(?P<url>https?://(?:www\.)?ollama\.com/)|(?P<scheme>\bollama://)|(?P<colon>\bollama:))"
+    r"(?P<model>timidlly/unified-v1)(?P<tag>:(?(url)[^\s'\")]+|[^\s'\"`]+))?",
     flags=re.IGNORECASE,
 )
+# Every line boundary str.splitlines() recognises, as a character class body
+LINE_BREAKS = r"\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029"
+LINE_BREAK_RE = re.compile(rf"\r\n|[{LINE_BREAKS}]")
+LEADING_WS_RE = re.compile(rf"[^\S{LINE_BREAKS}]*")
+# Whitespace inside the command never crosses a line boundary, so matches over the
+# whole text stay within the line str.splitlines() would have produced
 OLLAMA_PULL_RE = re.compile(
-    r"(?P<leading>^|\s)(?P<cmd>ollama\s+pull\s+)(?P<model>timidlly/unified-v1)(?P<tag>:[^\s'\"`]+)?(?P<trail>.*)$",
-    flags=re.IGNORECASE | re.MULTILINE,
+    rf"(?<!\S)(?P<cmd>ollama[^\S{LINE_BREAKS}]+pull[^\S{LINE_BREAKS}]+)(?P<model>timidlly/unified-v1)(?P<tag>:[^\s'\"`]+)?",
+    flags=re.IGNORECASE,
 )
+# Cheap guard for step 4; matches the literal the script has always checked for
+HAS_OLLAMA_PULL_RE = re.compile(r"ollama pull", re.IGNORECASE)
+# Every rewrite above needs the model name, so files without it are skipped undecoded
+MODEL_BYTES_RE = re.compile(rb"timidlly/unified-v1", re.IGNORECASE)
 
 # Files to skip by name or extension
-SKIP_DIRS = {".git", ".venv", "venv", "node_modules", ".cache"}
-SKIP_EXTS = {
+SKIP_DIRS = frozenset({".git", ".venv", "venv", "node_modules", ".cache"})
+SKIP_EXTS = frozenset({
     ".png", ".jpg", ".jpeg", ".gif", ".svg", ".zip", ".tar", ".gz", ".bin", ".exe", ".dll", ".so",
-}
+})
 
 HF_BASE = "https://huggingface.co/timidlly/unified-v1"
 
@@ -65,94 +76,139 @@ def transform_text(path: Path, text: str) -> Tuple[str, List[str]]:
     changes: List[str] = []
     new = text
 
-    # 1) Replace full https://ollama.com/... URLs directly
-    def repl_url(m: re.Match) -> str:
-        model = m.group("model")
-        tag = m.group("tag") or ""
-        replacement = HF_BASE + (tag or "")
-        changes.append(f"URL -> {replacement}")
-        return replacement
-
-    new, n_url = URL_OLLAMA_RE.subn(repl_url, new)
-
-    # 2) Replace ollama://... scheme
-    def repl_scheme(m: re.Match) -> str:
-        model = m.group("model")
-        tag = m.group("tag") or ""
-        replacement = HF_BASE + (tag or "")
-        changes.append(f"ollama:// -> {replacement}")
-        return replacement
-
-    new, n_scheme = OLLAMA_SCHEME_RE.subn(repl_scheme, new)
+    # 1-3) Replace https://ollama.com/..., ollama://... and inline ollama:... in one pass.
+    # Descriptions are grouped by form so they list in the same order as before.
+    labels = {"url": "URL -> ", "scheme": "ollama:// -> ", "colon": "ollama: -> "}
+    found: dict[str, List[str]] = {kind: [] for kind in labels}
 
-    # 3) Replace ollama:timidlly/unified-v1 patterns (inline)
-    def repl_colon(m: re.Match) -> str:
-        model = m.group("model")
+    def repl_ref(m: re.Match) -> str:
         tag = m.group("tag") or ""
-        replacement = HF_BASE + (tag or "")
-        changes.append(f"ollama: -> {replacement}")
+        replacement = HF_BASE + tag
+        kind = "url" if m.group("url") else "scheme" if m.group("scheme") else "colon"
+        found[kind].append(f"{labels[kind]}{replacement}")
         return replacement
 
-    new, n_colon = OLLAMA_COLON_RE.subn(repl_colon, new)
+    new = OLLAMA_REF_RE.sub(repl_ref, new)
+    for descriptions in found.values():
+        changes.extend(descriptions)
 
     # 4) For 'ollama pull' commands: keep original, insert commented HF alternatives
-    # We'll iterate lines and build output to preserve context and exact indentation.
-    if "ollama pull" in new.lower():
-        lines = new.splitlines(keepends=True)
-        out_lines: List[str] = []
-        for ln in lines:
-            m = OLLAMA_PULL_RE.search(ln)
-            if m:
-                leading = m.group("leading") or ""
-                cmd = m.group("cmd")
-                model = m.group("model")
-                tag = m.group("tag") or ""
-                trail = m.group("trail") or ""
-                out_lines.append(ln)  # keep original
-                # build alternatives
-                hf_cmd = f"hf download {model}{tag}"
-                git_cmd = f"git clone https://huggingface.co/{model}"
-                # Comment style
-                c_pref = comment_prefix_for_path(path)
-                c_suf = comment_suffix_for_path(path)
-                # Use the same indentation as line start
-                indent = ""
-                leading_ws = re.match(r"^(\s*)", ln)
-                if leading_ws:
-                    indent = leading_ws.group(1)
-                # Insert commented alternatives
-                comment_lines = []
-                comment_lines.append(f"{indent}{c_pref} HF alternative: {hf_cmd} {c_suf}\n")
-                comment_lines.append(f"{indent}{c_pref} Git alternative: {git_cmd} {c_suf}\n")
-                out_lines.extend(comment_lines)
-                changes.append(f"Inserted HF alternatives for ollama pull {model}{tag}")
-            else:
-                out_lines.append(ln)
-        new = "".join(out_lines)
+    # One finditer over the whole text locates the commands; the comments are
+    # spliced in after each matching line, preserving its indentation.
+    if HAS_OLLAMA_PULL_RE.search(new):
+        # Comment style
+        c_pref = comment_prefix_for_path(path)
+        c_suf = comment_suffix_for_path(path)
+        parts: List[str] = []
+        last = 0
+        for m in OLLAMA_PULL_RE.finditer(new):
+            if m.start() < last:
+                # Only the first command on a line gets alternatives
+                continue
+            model = m.group("model")
+            tag = m.group("tag") or ""
+            # build alternatives
+            hf_cmd = f"hf download {model}{tag}"
+            git_cmd = f"git clone https://huggingface.co/{model}"
+            # Use the same indentation as line start; the last boundary before the
+            # match is usually just past the nearest "\n"
+            line_start = new.rfind("\n", last, m.start()) + 1 or last
+            for brk in LINE_BREAK_RE.finditer(new, line_start, m.start()):
+                line_start = brk.end()
+            indent = LEADING_WS_RE.match(new, line_start).group()
+            # Insert after the line's terminator, keeping the original line
+            line_end = LINE_BREAK_RE.search(new, m.end())
+            insert_at = len(new) if line_end is None else line_end.end()
+            parts.append(new[last:insert_at])
+            parts.append(f"{indent}{c_pref} HF alternative: {hf_cmd} {c_suf}\n")
+            parts.append(f"{indent}{c_pref} Git alternative: {git_cmd} {c_suf}\n")
+            changes.append(f"Inserted HF alternatives for ollama pull {model}{tag}")
+            last = insert_at
+        parts.append(new[last:])
+        new = "".join(parts)
 
     return new, changes
 
 def files_to_check(root: Path) -> List[Path]:
     result: List[Path] = []
-    for p in root.rglob("*"):
-        if p.is_dir():
-            if p.name in SKIP_DIRS:
-                # skip walking into this dir
-                # rglob still visits inside dirs; we'll simply skip by continue
-                continue
-        if p.is_file():
-            if p.suffix.lower() in SKIP_EXTS:
-                continue
-            if ".git" in p.parts:
+    for dirpath, dirnames, filenames in os.walk(root, topdown=True):
+        # prune in place so os.walk never descends into skipped dirs
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if os.path.splitext(name)[1].lower() in SKIP_EXTS:
                 continue
-            result.append(p)
+            path = os.path.join(dirpath, name)
+            # regular files (or links to them) only; never open FIFOs or sockets
+            if os.path.isfile(path):
+                result.append(Path(path))
     return result
 
+def read_candidate(path: Path) -> str | None:
+    """Return the file's text, or None if it is unreadable or cannot contain a match."""
+    try:
+        with open(path, "rb") as fh:
+            # Scan the mapped pages first; only files with a hit are read into memory
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if not MODEL_BYTES_RE.search(mm):
+                    return None
+                raw = mm[:]
+    except (OSError, ValueError):
+        # ValueError: empty files cannot be mapped (and cannot match)
+        return None
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    # Same universal-newline translation read_text() applies
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def write_atomic(path: Path, text: str, backup: bool = False) -> Path | None:
+    """Replace path's contents via a temp file in the same directory and os.replace.
+
+    Keeps the file mode; with backup, copies the original to <name>.bak first.
+    Returns the backup path, if one was made.
+    """
+    bak = None
+    if backup:
+        bak = path.with_suffix(path.suffix + ".bak")
+        shutil.copy2(path, bak)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp", delete=False
+    ) as tmp:
+        tmp.write(text)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+    try:
+        shutil.copymode(path, tmp.name)
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+    return bak
+
+def _process_file(path: Path, apply: bool, backup: bool = False) -> Tuple[List[str], bool, Path | None]:
+    """Read, transform and (with apply) rewrite one file.
+
+    Returns (changes, text_changed, backup_path); printing is left to the caller.
+    """
+    text = read_candidate(path)
+    if text is None:
+        return [], False, None
+    new_text, changes = transform_text(path, text)
+    changed = bool(changes) and new_text != text
+    bak = None
+    if changed and apply:
+        bak = write_atomic(path, new_text, backup=backup)
+    return changes, changed, bak
+
 def main(argv: List[str] | None = None) -> int:
     ap = argparse.ArgumentParser(
         description="Replace Ollama timidlly/unified-v1 references with Hugging Face equivalents."
     )
     ap.add_argument("--apply", action="store_true", help="Write changes to files (dry-run by default).")
+    ap.add_argument("--backup", action="store_true", help="With --apply, keep a .bak copy of each changed file.")
     ap.add_argument("--root", default=".", help="Repository root to scan (default: current directory).")
     ap.add_argument("--branch", default="fix/replace-unified-links", help="Suggested branch name for commits.")
     args = ap.parse_args(argv)
@@ -164,25 +220,22 @@ def main(argv: List[str] | None = None) -> int:
     total_changes = 0
     changed_files: List[Tuple[Path, List[str]]] = []
 
-    for f in candidates:
-        try:
-            text = f.read_text(encoding="utf-8")
-        except Exception:
-            continue
-        new_text, changes = transform_text(f, text)
-        if changes and new_text != text:
-            total_changes += len(changes)
-            changed_files.append((f, changes))
-            print(f"[PROPOSE] {f} -> {len(changes)} change(s): {changes}")
-            if args.apply:
-                # write atomically
-                bak = f.with_suffix(f.suffix + ".bak")
-                f.rename(bak)
-                f.write_text(new_text, encoding="utf-8")
-                print(f"[WRITE] updated {f} (backup at {bak})")
-        elif changes and new_text == text:
-            # unusual: logged change but text same; still report
-            print(f"[NOTE] {f} had detections but no textual change necessary: {changes}")
+    # Files are independent and mostly I/O-bound; map() keeps the report in scan order
+    workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(partial(_process_file, apply=args.apply, backup=args.backup), candidates)
+        for f, (changes, changed, bak) in zip(candidates, results):
+            if changed:
+                total_changes += len(changes)
+                changed_files.append((f, changes))
+                print(f"[PROPOSE] {f} -> {len(changes)} change(s): {changes}")
+                if bak is not None:
+                    print(f"[WRITE] updated {f} (backup at {bak})")
+                elif args.apply:
+                    print(f"[WRITE] updated {f}")
+            elif changes:
+                # unusual: logged change but text same; still report
+                print(f"[NOTE] {f} had detections but no textual change necessary: {changes}")
 
     print(f"[replace_unified_links] Completed. Files with proposed changes: {len(changed_files)}")
     if not args.apply:
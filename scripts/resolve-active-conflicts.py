@@ -13,33 +13,40 @@ Resolves conflicts in an active merge state
 import os
 import sys
 import subprocess
-import re  # Remove this line
+import re
 from typing import List
 
+# Conflict marker at line start; group()[:1] tells b'<' (ours), b'=' (split) and b'>' (theirs) apart.
+# Files are handled as bytes split with keepends, so original line endings survive the rewrite.
+CONFLICT_MARKER_RE = re.compile(rb'<{7}|={7}|>{7}')
+
 def resolve_gitignore_conflicts(file_path: str = ".gitignore") -> bool:
     """Resolve conflicts in .gitignore files by merging unique entries"""
     print(f"🔧 Resolving .gitignore conflicts in {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             content = f.read()
         
         # Extract all unique gitignore entries
         entries = set()
         comments = []
+        seen_comments = set()
         
-        lines = content.split('\n')
+        lines = content.splitlines()
         in_conflict = False
         
         for line in lines:
-            if line.startswith('<<<<<<<') or line.startswith('=======') or line.startswith('>>>>>>>'):
-                in_conflict = not in_conflict if line.startswith('=======') else in_conflict
+            marker = CONFLICT_MARKER_RE.match(line)
+            if marker:
+                in_conflict = not in_conflict if marker.group()[:1] == b'=' else in_conflict
                 continue
             
             stripped = line.strip()
             if stripped:
-                if stripped.startswith('#'):
-                    if stripped not in [c.strip() for c in comments]:
+                if stripped.startswith(b'#'):
+                    if stripped not in seen_comments:
+                        seen_comments.add(stripped)
                         comments.append(stripped)
                 else:
                     entries.add(stripped)
@@ -49,23 +56,23 @@ def resolve_gitignore_conflicts(file_path: str = ".gitignore") -> bool:
         
         # Add header comment
         merged_content.extend([
-            "# DevUtilityV2 - Merged .gitignore",
-            "# Auto-resolved merge conflicts",
-            ""
+            b"# DevUtilityV2 - Merged .gitignore",
+            b"# Auto-resolved merge conflicts",
+            b""
         ])
         
         # Add all comments
         for comment in comments:
             merged_content.append(comment)
         
-        merged_content.append("")
+        merged_content.append(b"")
         
         # Add all unique entries sorted
         for entry in sorted(entries):
             merged_content.append(entry)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(merged_content))
+        with open(file_path, 'wb') as f:
+            f.write(b'\n'.join(merged_content))
         
         print(f"✅ Successfully resolved .gitignore conflicts")
         return True
@@ -79,10 +86,10 @@ def resolve_gradle_conflicts(file_path: str) -> bool:
     print(f"🔧 Resolving Gradle conflicts in {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             content = f.read()
         
-        lines = content.split('\n')
+        lines = content.splitlines(keepends=True)
         resolved_lines = []
         in_conflict = False
         head_section = []
@@ -90,14 +97,16 @@ def resolve_gradle_conflicts(file_path: str) -> bool:
         conflict_section = ""
         
         for line in lines:
-            if line.startswith('<<<<<<<'):
+            marker = CONFLICT_MARKER_RE.match(line)
+            kind = marker.group()[:1] if marker else None
+            if kind == b'<':
                 in_conflict = True
                 conflict_section = "head"
                 continue
-            elif line.startswith('======='):
+            elif kind == b'=':
                 conflict_section = "incoming"
                 continue
-            elif line.startswith('>>>>>>>'):
+            elif kind == b'>':
                 # Merge the sections intelligently
                 merged = merge_gradle_sections(head_section, incoming_section)
                 resolved_lines.extend(merged)
@@ -116,8 +125,8 @@ def resolve_gradle_conflicts(file_path: str) -> bool:
             else:
                 resolved_lines.append(line)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(resolved_lines))
+        with open(file_path, 'wb') as f:
+            f.write(b''.join(resolved_lines))
         
         print(f"✅ Successfully resolved Gradle conflicts in {file_path}")
         return True
@@ -126,7 +135,7 @@ def resolve_gradle_conflicts(file_path: str) -> bool:
         print(f"❌ Failed to resolve Gradle conflicts in {file_path}: {e}")
         return False
 
-def merge_gradle_sections(head_lines: List[str], incoming_lines: List[str]) -> List[str]:
+def merge_gradle_sections(head_lines: List[bytes], incoming_lines: List[bytes]) -> List[bytes]:
     """Intelligently merge Gradle configuration sections"""
     # For Gradle files, combine both sections and prefer incoming when conflicts
     merged = []
@@ -140,15 +149,19 @@ def merge_gradle_sections(head_lines: List[str], incoming_lines: List[str]) -> L
         secondary = incoming_lines
     
     # Add all lines from primary section
+    seen_lines = set()
     for line in primary:
-        if line.strip():
+        stripped = line.strip()
+        if stripped:
             merged.append(line)
+            seen_lines.add(stripped)
     
     # Add unique lines from secondary section
-    primary_content = '\n'.join(primary)
     for line in secondary:
-        if line.strip() and line.strip() not in primary_content:
+        stripped = line.strip()
+        if stripped and stripped not in seen_lines:
             merged.append(line)
+            seen_lines.add(stripped)
     
     return merged
 
@@ -157,10 +170,10 @@ def resolve_readme_conflicts(file_path: str = "README.md") -> bool:
     print(f"🔧 Resolving README conflicts in {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(file_path, 'rb') as f:
             content = f.read()
         
-        lines = content.split('\n')
+        lines = content.splitlines(keepends=True)
         resolved_lines = []
         in_conflict = False
         head_section = []
@@ -168,14 +181,16 @@ def resolve_readme_conflicts(file_path: str = "README.md") -> bool:
         conflict_section = ""
         
         for line in lines:
-            if line.startswith('<<<<<<<'):
+            marker = CONFLICT_MARKER_RE.match(line)
+            kind = marker.group()[:1] if marker else None
+            if kind == b'<':
                 in_conflict = True
                 conflict_section = "head"
                 continue
-            elif line.startswith('======='):
+            elif kind == b'=':
                 conflict_section = "incoming"
                 continue
-            elif line.startswith('>>>>>>>'):
+            elif kind == b'>':
                 # For README, prefer the more comprehensive version (usually incoming)
                 if len(incoming_section) > len(head_section):
                     resolved_lines.extend(incoming_section)
@@ -196,8 +211,8 @@ def resolve_readme_conflicts(file_path: str = "README.md") -> bool:
             else:
                 resolved_lines.append(line)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(resolved_lines))
+        with open(file_path, 'wb') as f:
+            f.write(b''.join(resolved_lines))
         
         print(f"✅ Successfully resolved README conflicts")
         return True
@@ -209,13 +224,30 @@ def resolve_readme_conflicts(file_path: str = "README.md") -> bool:
 def get_conflicted_files() -> List[str]:
     """Get list of conflicted files in active merge"""
     try:
+        # One NUL-delimited status call; paths come back unquoted. Untracked files
+        # are never unmerged, so skip enumerating them.
         result = subprocess.run(
-            ["git", "diff", "--name-only", "--diff-filter=U"],
-            capture_output=True, text=True, check=True
+            ["git", "status", "--porcelain=v2", "-z", "--untracked-files=no"],
+            capture_output=True, check=True
         )
-        return [f.strip() for f in result.stdout.split('\n') if f.strip()]
     except subprocess.CalledProcessError:
         return []
+    # Unmerged records: "u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>"
+    return [
+        record.split(b" ", 10)[10].decode('utf-8', 'surrogateescape')
+        for record in result.stdout.split(b"\0")
+        if record.startswith(b"u ")
+    ]
+
+def stage_files(file_paths: List[str]) -> bool:
+    """Stage resolved files with a single git add"""
+    if not file_paths:
+        return True
+    try:
+        subprocess.run(["git", "add", "--", *file_paths], check=True)
+        return True
+    except subprocess.CalledProcessError:
+        return False
 
 def main():
     """Main function to resolve active merge conflicts"""
@@ -247,21 +279,26 @@ def main():
         'README.md': resolve_readme_conflicts,
     }
     
-    resolved_count = 0
+    resolved_files = []
     
     # Resolve each file
     for file_path in conflicted_files:
         if file_path in strategies:
             if strategies[file_path](file_path):
-                # Stage the resolved file
-                import shlex
-                resolved_count += 1
-                print(f"✅ Staged resolved file: {file_path}")
+                resolved_files.append(file_path)
             else:
                 print(f"⚠️  Could not auto-resolve: {file_path}")
         else:
             print(f"⚠️  No strategy for: {file_path} (manual resolution needed)")
     
+    # Stage everything that was resolved in one git add
+    if stage_files(resolved_files):
+        for file_path in resolved_files:
+            print(f"✅ Staged resolved file: {file_path}")
+    else:
+        print("⚠️  Could not stage resolved files; run git add manually")
+    resolved_count = len(resolved_files)
+    
     print()
     print(f"📊 Resolution Summary:")
     print(f"  Total files: {len(conflicted_files)}")
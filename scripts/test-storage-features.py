@@ -6,8 +6,12 @@ Validates that the new storage features are properly integrated
 """
 
 import asyncio
+import mmap
+import os
+import re
 import sys
 from pathlib import Path
+from typing import Iterable, Set
 
 # Add the current directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -45,12 +49,21 @@ async def test_storage_features():
         if storage_dir.exists():
             print(f"✅ Storage directory created: {storage_dir}")
             
+            # Walk the storage tree once: collect every name for the guide lookups
+            # and each directory's direct entry count for the subdirectory report
+            all_names = set()
+            entry_counts = {}
+            for dirpath, dirnames, filenames in os.walk(storage_dir):
+                all_names.update(dirnames)
+                all_names.update(filenames)
+                entry_counts[dirpath] = len(dirnames) + len(filenames)
+            
             # Check subdirectories
             subdirs = ['numpy_memmap', 'zram', 'zram_repos', 'linux_kernel']
             for subdir in subdirs:
                 subdir_path = storage_dir / subdir
                 if subdir_path.exists():
-                    file_count = len(list(subdir_path.glob('*')))
+                    file_count = entry_counts.get(str(subdir_path), 0)
                     print(f"✅ {subdir}: {file_count} files created")
                 else:
                     print(f"⚠️  {subdir}: Directory not created")
@@ -63,8 +76,7 @@ async def test_storage_features():
             ]
             
             for guide in guides:
-                guide_paths = list(storage_dir.rglob(guide))
-                if guide_paths:
+                if guide in all_names:
                     print(f"✅ {guide}: Created")
                 else:
                     print(f"⚠️  {guide}: Not found")
@@ -80,6 +92,40 @@ async def test_storage_features():
     print("🎉 Storage features test completed!")
     return True
 
+def find_in_file(path: Path, needles: Iterable[str]) -> Set[str]:
+    """Return the needles that occur in path, searched in place through mmap.
+
+    One compiled alternation, one forward pass. The zero-width lookahead tries
+    every offset, so overlapping needles are all seen; longest-first order picks
+    the longest needle at each offset, and any shorter needle contained in a
+    match is present too. Stops as soon as every needle has been found.
+    """
+    remaining = set(needles)
+    found = set()
+    if not remaining:
+        return found
+    with path.open('rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped (and contain nothing)
+            return found
+        with mm:
+            alternation = b"|".join(
+                re.escape(needle.encode()) for needle in sorted(remaining, key=len, reverse=True)
+            )
+            pattern = re.compile(b"(?=(" + alternation + b"))")
+            for match in pattern.finditer(mm):
+                hit = match.group(1).decode()
+                if hit not in remaining:
+                    continue
+                covered = {needle for needle in remaining if needle in hit}
+                found |= covered
+                remaining -= covered
+                if not remaining:
+                    break
+    return found
+
 def test_living_environment_integration():
     """Test living environment integration"""
     print("\n🧬 Testing Living Environment Integration...")
@@ -88,8 +134,6 @@ def test_living_environment_integration():
     # Check if wrapper functions are available
     wrapper_file = Path(".living_environment_wrapper.sh")
     if wrapper_file.exists():
-        content = wrapper_file.read_text()
-        
         # Check for storage functions
         storage_functions = [
             'storage_features_enable',
@@ -97,9 +141,10 @@ def test_living_environment_integration():
             'memmap_status',
             'storage_optimization_report'
         ]
+        found = find_in_file(wrapper_file, storage_functions)
         
         for func in storage_functions:
-            if func in content:
+            if func in found:
                 print(f"✅ {func}: Integrated in wrapper")
             else:
                 print(f"❌ {func}: Missing from wrapper")
@@ -110,8 +155,7 @@ def test_living_environment_integration():
     # Check activator
     activator_file = Path(".activate_living_environment")
     if activator_file.exists():
-        content = activator_file.read_text()
-        if "storage_features_enable" in content:
+        if find_in_file(activator_file, ["storage_features_enable"]):
             print("✅ Storage commands added to activator")
         else:
             print("⚠️  Storage commands not found in activator")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Hardened Permissions Manager
+Validates the sqlite permissions database, legacy JSON migration
+and the read-only --verify path
+"""
+
+import unittest
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# The script name is not importable, load it by path
+spec = importlib.util.spec_from_file_location(
+    "hardened_permissions_manager",
+    Path(__file__).parent / "hardened-permissions-manager.py"
+)
+hardened_permissions_manager = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(hardened_permissions_manager)
+
+class TestPermissionsDatabase(unittest.TestCase):
+    """Test cases for _save_permissions_db and verify_permissions"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.manager = hardened_permissions_manager.HardenedPermissionsManager(str(self.root))
+        self.script = self.root / "run.sh"
+        self.secret = self.root / "api.key"
+        self.script.write_text("#!/bin/sh\n", encoding="utf-8")
+        self.secret.write_text("key\n", encoding="utf-8")
+        os.chmod(self.script, 0o755)
+        os.chmod(self.secret, 0o600)
+        self.applied = [
+            {"file": str(self.script), "permissions": "0755", "owner": "user", "group": "user", "set": "scripts"},
+            {"file": str(self.secret), "permissions": "0600", "owner": "root", "group": "root", "set": "secrets"},
+        ]
+
+    def verify(self):
+        """Run verify_permissions, returning its result and printed output"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            result = self.manager.verify_permissions()
+        return result, out.getvalue()
+
+    def rows(self):
+        with contextlib.closing(sqlite3.connect(self.manager.permissions_db)) as conn:
+            return sorted(conn.execute("SELECT path, mode, set_name FROM perms"))
+
+    def test_save_and_verify_round_trip(self):
+        """Saved permissions verify cleanly until a mode drifts"""
+        self.manager._save_permissions_db(self.applied)
+        self.assertEqual(self.rows(), sorted([
+            (str(self.script), "0755", "scripts"),
+            (str(self.secret), "0600", "secrets"),
+        ]))
+        self.assertEqual(self.verify()[0], True)
+
+        os.chmod(self.secret, 0o644)
+        result, output = self.verify()
+        self.assertFalse(result)
+        self.assertIn(f"Permission mismatch: {self.secret}", output)
+
+    def test_save_replaces_previous_run(self):
+        """Each save records only the files applied in that run"""
+        self.manager._save_permissions_db(self.applied)
+        self.manager._save_permissions_db(self.applied[:1])
+        self.assertEqual(self.rows(), [(str(self.script), "0755", "scripts")])
+
+    def test_missing_file_fails_verification(self):
+        self.manager._save_permissions_db(self.applied)
+        self.script.unlink()
+        result, output = self.verify()
+        self.assertFalse(result)
+        self.assertIn(f"File not found: {self.script}", output)
+
+    def test_legacy_json_database_is_migrated(self):
+        """A pre-sqlite JSON file is reported by --verify and replaced by the next save"""
+        self.manager.permissions_db.write_text(
+            json.dumps({"applied_permissions": self.applied}), encoding="utf-8"
+        )
+        result, output = self.verify()
+        self.assertFalse(result)
+        self.assertIn("legacy (pre-sqlite) database", output)
+
+        self.manager._save_permissions_db(self.applied)
+        self.assertEqual(len(self.rows()), 2)
+        self.assertEqual(self.verify()[0], True)
+
+    def test_verify_does_not_write(self):
+        """--verify opens the database read-only: no journal mode switch, no schema changes"""
+        with contextlib.closing(sqlite3.connect(self.manager.permissions_db)) as conn:
+            conn.execute("CREATE TABLE perms(path TEXT PRIMARY KEY, mode TEXT, owner TEXT, grp TEXT, set_name TEXT)")
+            conn.execute("INSERT INTO perms VALUES (?,?,?,?,?)", (str(self.script), "0755", "user", "user", "scripts"))
+            conn.commit()
+        before = self.manager.permissions_db.read_bytes()
+
+        self.assertEqual(self.verify()[0], True)
+
+        self.assertEqual(self.manager.permissions_db.read_bytes(), before)
+        with contextlib.closing(sqlite3.connect(self.manager.permissions_db)) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+            tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        self.assertEqual(tables, {"perms"})
+
+    def test_bad_mode_fails_verification(self):
+        """An unparsable stored mode is reported rather than raised"""
+        self.manager._save_permissions_db(self.applied)
+        with contextlib.closing(sqlite3.connect(self.manager.permissions_db)) as conn:
+            with conn:
+                conn.execute("UPDATE perms SET mode = 'rwx'")
+        result, output = self.verify()
+        self.assertFalse(result)
+        self.assertIn("Error verifying permissions", output)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test suite for the DevUtility Repository Organizer
+Validates that the compiled move matchers pick the same files and
+destinations as globbing each pattern in file_moves order
+"""
+
+import unittest
+import fnmatch
+import importlib.util
+import os
+import tempfile
+from pathlib import Path
+
+# The script name is not importable, load it by path
+spec = importlib.util.spec_from_file_location(
+    "organize_repository",
+    Path(__file__).parent / "organize-repository.py"
+)
+organize_repository = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(organize_repository)
+
+def glob_plan(moves, root):
+    """Reference planner: the first destination with a pattern matching a file wins,
+    as when each destination's patterns were globbed and moved in turn"""
+    planned = {dest_dir: [] for dest_dir in moves}
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name)
+        if name.startswith('.') or not os.path.isfile(path):
+            continue
+        for dest_dir, patterns in moves.items():
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                planned[dest_dir].append(path)
+                break
+    return planned
+
+class TestPlanMoves(unittest.TestCase):
+    """Test cases for compile_file_moves/plan_moves"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = self.temp_dir.name
+
+    def touch(self, *names):
+        for name in names:
+            Path(self.root, name).write_text(name, encoding="utf-8")
+
+    def plan(self, moves):
+        matchers, destinations = organize_repository.compile_file_moves(moves)
+        planned = organize_repository.plan_moves(matchers, destinations, self.root)
+        return {dest_dir: sorted(paths) for dest_dir, paths in planned.items()}
+
+    def test_matches_glob_order_for_file_moves(self):
+        """Every pattern in the real move table plans like the glob loop"""
+        names = set()
+        for patterns in organize_repository.file_moves.values():
+            for pattern in patterns:
+                literal = pattern.replace("*", "")
+                names.update({pattern.replace("*", "x"), literal, f"pre{literal}", f"{literal}.bak"})
+        names.update({"README.md", "notes.TXT", "Makefile", "a.py.txt", "archive.tar.gz", "x" * 40})
+        # Names glob could not create portably, or that point outside the root
+        names = {name for name in names if name and "/" not in name}
+        self.touch(*names)
+        self.assertEqual(
+            self.plan(organize_repository.file_moves),
+            glob_plan(organize_repository.file_moves, self.root),
+        )
+
+    def test_first_destination_wins(self):
+        """A file matched by several destinations goes to the first one listed"""
+        self.touch("build.gradle", "settings.gradle", "main.py")
+        moves = {"configs/build/": ["build.*"], "scripts/": ["*.gradle", "*.py"]}
+        planned = self.plan(moves)
+        self.assertEqual(planned["configs/build/"], [os.path.join(self.root, "build.gradle")])
+        self.assertEqual(planned["scripts/"], [
+            os.path.join(self.root, "main.py"),
+            os.path.join(self.root, "settings.gradle"),
+        ])
+
+    def test_extension_patterns_do_not_shadow_generic_ones(self):
+        """Per-extension matchers still honour an earlier generic pattern"""
+        self.touch("Notes_today.md", "guide.md")
+        moves = {"archive/": ["Notes_*"], "docs/": ["*.md"]}
+        planned = self.plan(moves)
+        self.assertEqual(planned["archive/"], [os.path.join(self.root, "Notes_today.md")])
+        self.assertEqual(planned["docs/"], [os.path.join(self.root, "guide.md")])
+
+    def test_skips_dot_files_and_directories(self):
+        """Hidden files and directories are never planned, as with glob()"""
+        self.touch(".hidden.py", "tool.py")
+        os.mkdir(os.path.join(self.root, "pkg.py"))
+        planned = self.plan({"scripts/": ["*.py"]})
+        self.assertEqual(planned["scripts/"], [os.path.join(self.root, "tool.py")])
+
+    def test_empty_destination_is_planned(self):
+        """Destinations without matches are still listed so their directory is created"""
+        self.touch("tool.py")
+        planned = self.plan({"scripts/": ["*.py"], "docs/": ["*.md"]})
+        self.assertEqual(planned["docs/"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Active Merge Conflict Resolver
+Validates marker detection and byte-exact rewriting of conflicted files
+"""
+
+import unittest
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+from pathlib import Path
+
+# The script name is not importable, load it by path
+spec = importlib.util.spec_from_file_location(
+    "resolve_active_conflicts",
+    Path(__file__).parent / "resolve-active-conflicts.py"
+)
+resolve_active_conflicts = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(resolve_active_conflicts)
+
+GRADLE_CONFLICT = (
+    b"plugins {\n"
+    b"<<<<<<< HEAD\n"
+    b"    id 'a'\n"
+    b"    id 'b'\n"
+    b"=======\n"
+    b"    id 'b'\n"
+    b"    id 'c'\n"
+    b"    id 'd'\n"
+    b">>>>>>> feature\n"
+    b"}\n"
+)
+GRADLE_RESOLVED = b"plugins {\n    id 'b'\n    id 'c'\n    id 'd'\n    id 'a'\n}\n"
+
+class TestConflictResolvers(unittest.TestCase):
+    """Test cases for the .gitignore, Gradle and README resolvers"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def resolve(self, resolver, content, name="file"):
+        """Write content, run resolver on it quietly and return the rewritten bytes"""
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(resolver(path))
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_gradle_merges_both_sides(self):
+        """The longer side comes first, then unseen lines from the other"""
+        resolved = self.resolve(resolve_active_conflicts.resolve_gradle_conflicts, GRADLE_CONFLICT)
+        self.assertEqual(resolved, GRADLE_RESOLVED)
+
+    def test_gradle_keeps_crlf_line_endings(self):
+        resolved = self.resolve(
+            resolve_active_conflicts.resolve_gradle_conflicts,
+            GRADLE_CONFLICT.replace(b"\n", b"\r\n"),
+        )
+        self.assertEqual(resolved, GRADLE_RESOLVED.replace(b"\n", b"\r\n"))
+
+    def test_gradle_keeps_undecodable_bytes(self):
+        """Non-UTF-8 content is carried through unchanged instead of failing to decode"""
+        content = GRADLE_CONFLICT.replace(b"id 'c'", b"id '\xe9'")
+        resolved = self.resolve(resolve_active_conflicts.resolve_gradle_conflicts, content)
+        self.assertEqual(resolved, GRADLE_RESOLVED.replace(b"id 'c'", b"id '\xe9'"))
+
+    def test_stray_markers_outside_a_hunk(self):
+        """A lone '=======' or '>>>>>>>' line is dropped and the text around it kept"""
+        resolved = self.resolve(
+            resolve_active_conflicts.resolve_gradle_conflicts,
+            b"a\n=======\nb\n>>>>>>> x\nc\n",
+        )
+        self.assertEqual(resolved, b"a\nb\nc\n")
+
+    def test_readme_prefers_longer_side(self):
+        resolved = self.resolve(
+            resolve_active_conflicts.resolve_readme_conflicts,
+            b"# T\r\n<<<<<<< HEAD\r\nold\r\n=======\r\nnew one\r\nnew two\r\n>>>>>>> x\r\nend\r\n",
+        )
+        self.assertEqual(resolved, b"# T\r\nnew one\r\nnew two\r\nend\r\n")
+
+    def test_gitignore_merges_unique_entries(self):
+        """Comments keep first-seen order, entries are deduplicated and sorted"""
+        resolved = self.resolve(
+            resolve_active_conflicts.resolve_gitignore_conflicts,
+            b"# deps\nnode_modules/\n"
+            b"<<<<<<< HEAD\n*.log\n# build\nbuild/\n"
+            b"=======\n*.log\n# build\nout/\n"
+            b">>>>>>> x\n",
+            name=".gitignore",
+        )
+        self.assertEqual(resolved, (
+            b"# DevUtilityV2 - Merged .gitignore\n"
+            b"# Auto-resolved merge conflicts\n"
+            b"\n"
+            b"# deps\n"
+            b"# build\n"
+            b"\n"
+            b"*.log\n"
+            b"build/\n"
+            b"node_modules/\n"
+            b"out/"
+        ))
+
+    def test_marker_needs_seven_characters_at_line_start(self):
+        """Shorter runs and indented markers are ordinary content"""
+        marker = resolve_active_conflicts.CONFLICT_MARKER_RE
+        self.assertIsNotNone(marker.match(b"<<<<<<< HEAD\n"))
+        self.assertIsNotNone(marker.match(b"=======\r\n"))
+        self.assertIsNone(marker.match(b"====== heading\n"))
+        self.assertIsNone(marker.match(b"  >>>>>>> quoted\n"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,9 +10,78 @@ import json
 import os
 import sys
 import re
+import tempfile
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pathlib import Path
+from types import MappingProxyType
 from typing import Dict, List, Optional
 
+try:
+    import orjson  # optional C encoder for the analysis output
+except ImportError:
+    orjson = None
+
+ISSUE_NUMBER_RE = re.compile(r'#(\d+)')
+# Bullet lines, or lines mentioning must/should anywhere (ASCII case folding matches str.lower() here)
+REQUIREMENT_LINE_RE = re.compile(r'^[-*]|must|should', re.IGNORECASE | re.ASCII)
+KEYWORD_TOKEN_RE = re.compile(r'[a-z0-9+]+')
+# Technologies the Frontend Agent handles directly; each one found adds to its suitability score
+FRONTEND_TECHS = frozenset({"html", "css", "javascript", "js", "vanilla"})
+
+# Offline stand-ins for known issues, used when GITHUB_TOKEN is unset or the API call fails
+MOCK_ISSUES = MappingProxyType({
+    47: {
+        "number": 47,
+        "title": "To-Do List Application with Local Storage",
+        "body": """## Overview
+Create a simple to-do list application that persists tasks using local storage on the client side. The app should allow users to add, edit, delete, and mark tasks as completed, and all changes should be reflected in local storage for persistence across sessions.
+
+## Requirements
+- Users can add new tasks
+- Users can edit existing tasks  
+- Users can delete tasks
+- Users can mark tasks as completed/incomplete
+- Tasks are saved in local storage and restored on page reload
+
+## Technical Specifications
+- Frontend only (no backend required)
+- Use vanilla JavaScript, HTML, and CSS (no frameworks)
+- Code should be compatible with Android 10 browser (ES6 minimum, avoid newer APIs)
+- UI should be responsive and simple
+
+## Acceptance Criteria
+- All functionality must work without requiring any network connection
+- All task changes persist after reload (verify via local storage)
+- Clean, commented code and minimal UI""",
+        "labels": [{"name": "frontend"}, {"name": "javascript"}, {"name": "enhancement"}]
+    }
+})
+
+def _build_github_session() -> requests.Session:
+    """Keep-alive session shared by all GitHub API calls, with retries on connection errors"""
+    session = requests.Session()
+    session.headers.update({"Accept": "application/vnd.github.v3+json"})
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.3))
+    session.mount("https://", adapter)
+    return session
+
+GITHUB_SESSION = _build_github_session()
+
+# Bump when analyze_content/scoring changes so stale cached results are ignored
+ANALYSIS_CACHE_VERSION = 2
+# An empty XDG_CACHE_HOME counts as unset, per the XDG base directory spec
+ANALYSIS_CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "frontend_analyzer" / "issues.json"
+DEFAULT_GITHUB_REPOSITORY = "spiralgang/DevUl-Army--__--Living-Sriracha-AGI"
+
+def _github_repository() -> str:
+    return os.environ.get("GITHUB_REPOSITORY", DEFAULT_GITHUB_REPOSITORY)
+
+def _cache_key(issue_number: int) -> str:
+    """Issue numbers only identify an issue within a repository"""
+    return f"{_github_repository()}#{issue_number}"
+
 class FrontendAnalyzer:
     def __init__(self):
         self.frontend_keywords = {
@@ -30,13 +99,77 @@ class FrontendAnalyzer:
             "complex": ["spa", "single page", "framework", "bundling", "build process", "testing"]
         }
 
+        # Distinct keywords across all categories and complexity levels; several
+        # ("mobile", "responsive", "interactive") appear in more than one list
+        all_keywords = frozenset(
+            keyword
+            for groups in (self.frontend_keywords, self.complexity_indicators)
+            for keywords in groups.values()
+            for keyword in keywords
+        )
+        # Single words are matched as whole tokens; phrases ("local storage") by substring
+        self._keyword_words = frozenset(keyword for keyword in all_keywords if " " not in keyword)
+        self._keyword_phrases = tuple(keyword for keyword in all_keywords if " " in keyword)
+        self._complex_indicators = frozenset(self.complexity_indicators["complex"])
+        self._moderate_indicators = frozenset(self.complexity_indicators["moderate"])
+
+        # GitHub ETag per issue fetched this run, and the on-disk issue/result cache keyed by it
+        self._etags: Dict[int, str] = {}
+        self._cache = self._load_cache()
+
+    def _load_cache(self) -> Dict:
+        """Load cached issues and analyses; any unreadable or outdated cache is ignored"""
+        try:
+            with open(ANALYSIS_CACHE_FILE, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get("version") != ANALYSIS_CACHE_VERSION:
+            return {}
+        issues = cache.get("issues")
+        if not isinstance(issues, dict):
+            return {}
+        # Drop malformed entries (hand edits, partial writes) rather than fail on lookup
+        return {
+            key: entry for key, entry in issues.items()
+            if isinstance(entry, dict)
+            and isinstance(entry.get("etag"), str)
+            and isinstance(entry.get("issue"), dict)
+            and isinstance(entry.get("result"), dict)
+        }
+
+    def _save_cache(self) -> None:
+        """Write the cache atomically; failures only cost a refetch next run"""
+        tmp_path = None
+        try:
+            ANALYSIS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            # Unique temp name so concurrent runs never write into the same file
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=str(ANALYSIS_CACHE_FILE.parent),
+                prefix=f".{ANALYSIS_CACHE_FILE.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                tmp_path = f.name
+                json.dump({"version": ANALYSIS_CACHE_VERSION, "issues": self._cache}, f)
+            os.replace(tmp_path, ANALYSIS_CACHE_FILE)
+        except OSError as e:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+            print(f"Warning: could not write analysis cache: {e}", file=sys.stderr)
+
     def extract_issue_number(self, issue_input: str) -> Optional[int]:
         """Extract issue number from various input formats"""
         if issue_input.isdigit():
             return int(issue_input)
         
         # Try to extract from PR body or other text
-        match = re.search(r'#(\d+)', issue_input)
+        match = ISSUE_NUMBER_RE.search(issue_input)
         if match:
             return int(match.group(1))
             
@@ -49,16 +182,26 @@ class FrontendAnalyzer:
             print("Warning: No GITHUB_TOKEN found, using mock data", file=sys.stderr)
             return self.get_mock_issue_data(issue_number)
         
-        repo = os.environ.get("GITHUB_REPOSITORY", "spiralgang/DevUl-Army--__--Living-Sriracha-AGI")
+        repo = _github_repository()
         
+        # Accept header comes from the shared session
         headers = {
-            "Authorization": f"token {github_token}",
-            "Accept": "application/vnd.github.v3+json"
+            "Authorization": f"token {github_token}"
         }
+        # Conditional request: an unchanged issue comes back as a 304 with no body
+        cached = self._cache.get(_cache_key(issue_number))
+        if cached:
+            headers["If-None-Match"] = cached["etag"]
         
         try:
-            response = requests.get(f"https://api.github.com/repos/{repo}/issues/{issue_number}", headers=headers)
+            response = GITHUB_SESSION.get(f"https://api.github.com/repos/{repo}/issues/{issue_number}", headers=headers)
+            if response.status_code == 304 and cached:
+                self._etags[issue_number] = cached["etag"]
+                return cached["issue"]
             response.raise_for_status()
+            etag = response.headers.get("ETag")
+            if etag:
+                self._etags[issue_number] = etag
             return response.json()
         except requests.RequestException as e:
             print(f"Error fetching issue #{issue_number}: {e}", file=sys.stderr)
@@ -66,87 +209,53 @@ class FrontendAnalyzer:
 
     def get_mock_issue_data(self, issue_number: int) -> Dict:
         """Provide mock data for known issues"""
-        mock_issues = {
-            47: {
-                "number": 47,
-                "title": "To-Do List Application with Local Storage",
-                "body": """## Overview
-Create a simple to-do list application that persists tasks using local storage on the client side. The app should allow users to add, edit, delete, and mark tasks as completed, and all changes should be reflected in local storage for persistence across sessions.
-
-## Requirements
-- Users can add new tasks
-- Users can edit existing tasks  
-- Users can delete tasks
-- Users can mark tasks as completed/incomplete
-- Tasks are saved in local storage and restored on page reload
-
-## Technical Specifications
-- Frontend only (no backend required)
-- Use vanilla JavaScript, HTML, and CSS (no frameworks)
-- Code should be compatible with Android 10 browser (ES6 minimum, avoid newer APIs)
-- UI should be responsive and simple
-
-## Acceptance Criteria
-- All functionality must work without requiring any network connection
-- All task changes persist after reload (verify via local storage)
-- Clean, commented code and minimal UI""",
-                "labels": [{"name": "frontend"}, {"name": "javascript"}, {"name": "enhancement"}]
-            }
-        }
+        issue = MOCK_ISSUES.get(issue_number)
+        if issue is not None:
+            return dict(issue)
         
-        return mock_issues.get(issue_number, {
+        return {
             "number": issue_number,
             "title": "Unknown Issue",
             "body": "Issue data not available",
             "labels": []
-        })
+        }
 
     def analyze_content(self, content: str) -> Dict:
         """Analyze text content for frontend requirements"""
         content_lower = content.lower()
         
-        # Extract technology requirements
-        technologies = []
-        for tech in self.frontend_keywords["technologies"]:
-            if tech in content_lower:
-                technologies.append(tech)
-        
-        # Extract UI components needed
-        ui_components = []
-        for component in self.frontend_keywords["ui_components"]:
-            if component in content_lower:
-                ui_components.append(component)
-        
-        # Extract features
-        features = []
-        for feature in self.frontend_keywords["features"]:
-            if feature in content_lower:
-                features.append(feature)
-        
-        # Extract storage requirements
-        storage_needs = []
-        for storage in self.frontend_keywords["storage"]:
-            if storage in content_lower:
-                storage_needs.append(storage)
-        
-        # Determine complexity
-        complexity = "simple"
-        for level, indicators in self.complexity_indicators.items():
-            for indicator in indicators:
-                if indicator in content_lower:
-                    if level == "complex":
-                        complexity = "complex"
-                        break
-                    elif level == "moderate" and complexity == "simple":
-                        complexity = "moderate"
+        # Tokenize once and intersect, then read each category off the hits. Whole-word
+        # matching keeps "css" out of "access", "js" out of "json", "spa" out of "space";
+        # singular stems of "-s"/"-es" tokens keep "buttons", "boxes", "frameworks" matching.
+        tokens = set(KEYWORD_TOKEN_RE.findall(content_lower))
+        tokens.update([token[:-1] for token in tokens if token.endswith("s")])
+        tokens.update([token[:-2] for token in tokens if token.endswith("es")])
+        found = self._keyword_words.intersection(tokens).union(
+            phrase for phrase in self._keyword_phrases if phrase in content_lower
+        )
+        
+        technologies = [tech for tech in self.frontend_keywords["technologies"] if tech in found]
+        ui_components = [component for component in self.frontend_keywords["ui_components"] if component in found]
+        features = [feature for feature in self.frontend_keywords["features"] if feature in found]
+        storage_needs = [storage for storage in self.frontend_keywords["storage"] if storage in found]
+        
+        # Determine complexity: highest level with any indicator present wins
+        if not self._complex_indicators.isdisjoint(found):
+            complexity = "complex"
+        elif not self._moderate_indicators.isdisjoint(found):
+            complexity = "moderate"
+        else:
+            complexity = "simple"
         
         # Extract specific requirements
         requirements = []
-        lines = content.split('\n')
-        for line in lines:
+        for line in content.splitlines():
             line = line.strip()
-            if line.startswith('-') or line.startswith('*') or 'must' in line.lower() or 'should' in line.lower():
+            if REQUIREMENT_LINE_RE.search(line):
                 requirements.append(line)
+                # Limit to 10 most relevant; nothing after the tenth is used
+                if len(requirements) >= 10:
+                    break
         
         return {
             "technologies": technologies,
@@ -154,7 +263,7 @@ Create a simple to-do list application that persists tasks using local storage o
             "features": features,
             "storage_needs": storage_needs,
             "complexity": complexity,
-            "requirements": requirements[:10]  # Limit to 10 most relevant
+            "requirements": requirements
         }
 
     def analyze_issue(self, issue_number: int) -> Dict:
@@ -164,6 +273,12 @@ Create a simple to-do list application that persists tasks using local storage o
         if not issue_data:
             return {"error": f"Could not fetch issue #{issue_number}"}
         
+        # Same ETag as the cached analysis: the issue is unchanged, reuse the result
+        etag = self._etags.get(issue_number)
+        cached = self._cache.get(_cache_key(issue_number))
+        if etag and cached and cached["etag"] == etag:
+            return cached["result"]
+        
         # Combine title and body for analysis
         title = issue_data.get("title", "")
         body = issue_data.get("body", "")
@@ -188,6 +303,11 @@ Create a simple to-do list application that persists tasks using local storage o
             "estimated_effort": self.estimate_effort(analysis)
         }
         
+        # Only real GitHub responses carry an ETag; mock data is never cached
+        if etag:
+            self._cache[_cache_key(issue_number)] = {"etag": etag, "issue": issue_data, "result": result}
+            self._save_cache()
+        
         return result
 
     def generate_recommendations(self, analysis: Dict) -> Dict:
@@ -222,12 +342,10 @@ Create a simple to-do list application that persists tasks using local storage o
         score = 0
         reasons = []
         
-        # Technology match
-        frontend_techs = ["html", "css", "javascript", "js", "vanilla"]
-        for tech in analysis["technologies"]:
-            if tech in frontend_techs:
-                score += 2
-                reasons.append(f"Uses {tech}")
+        # Technology match (kept in analysis order so reasons read the same every run)
+        matched_techs = [tech for tech in analysis["technologies"] if tech in FRONTEND_TECHS]
+        score += 2 * len(matched_techs)
+        reasons.extend(f"Uses {tech}" for tech in matched_techs)
         
         # UI components
         if analysis["ui_components"]:
@@ -259,29 +377,34 @@ Create a simple to-do list application that persists tasks using local storage o
 
     def estimate_effort(self, analysis: Dict) -> Dict:
         """Estimate development effort"""
-        base_hours = 2
+        # Integer tenths of an hour and percent multipliers; floats only in the output
+        base_tenths = 20
         
         # Adjust for complexity
-        complexity_multipliers = {
-            "simple": 1.0,
-            "moderate": 1.5,
-            "complex": 2.5
+        complexity_percents = {
+            "simple": 100,
+            "moderate": 150,
+            "complex": 250
         }
-        multiplier = complexity_multipliers.get(analysis["complexity"], 1.0)
+        percent = complexity_percents.get(analysis["complexity"], 100)
         
         # Adjust for features
-        feature_hours = len(analysis["ui_components"]) * 0.5
-        storage_hours = 1 if analysis["storage_needs"] else 0
+        feature_tenths = len(analysis["ui_components"]) * 5
+        storage_tenths = 10 if analysis["storage_needs"] else 0
         
-        total_hours = (base_hours + feature_hours + storage_hours) * multiplier
+        # Round half to even, exactly as round(hours, 1) did on the float product
+        total_tenths, remainder = divmod((base_tenths + feature_tenths + storage_tenths) * percent, 100)
+        if remainder > 50 or (remainder == 50 and total_tenths % 2):
+            total_tenths += 1
+        multiplier = percent / 100
         
         return {
-            "estimated_hours": round(total_hours, 1),
+            "estimated_hours": total_tenths / 10,
             "complexity_factor": multiplier,
             "breakdown": {
-                "base_implementation": base_hours,
-                "ui_components": feature_hours,
-                "storage_integration": storage_hours,
+                "base_implementation": base_tenths // 10,
+                "ui_components": feature_tenths / 10,
+                "storage_integration": storage_tenths // 10,
                 "complexity_adjustment": f"{multiplier}x"
             }
         }
@@ -310,8 +433,13 @@ def main():
         sys.exit(1)
     
     # Save results
-    with open(args.output, "w") as f:
-        json.dump(result, f, indent=2)
+    if orjson is not None:
+        with open(args.output, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        # Same bytes as the orjson branch: UTF-8, non-ASCII left unescaped
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
     
     print(f"Analysis complete. Results saved to {args.output}")
     print(f"Agent suitability: {result['agent_suitability']['level']} ({result['agent_suitability']['confidence']}% confidence)")
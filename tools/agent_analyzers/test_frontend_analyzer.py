@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Frontend Issue Analyzer
+Validates keyword matching, complexity detection and the ETag analysis cache
+"""
+
+import unittest
+import json
+import tempfile
+import os
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add the analyzer directory to the path to import the module
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import frontend_analyzer
+from frontend_analyzer import FrontendAnalyzer
+
+class TestAnalyzeContent(unittest.TestCase):
+    """Test cases for FrontendAnalyzer.analyze_content"""
+
+    def setUp(self):
+        self.analyzer = FrontendAnalyzer()
+
+    def test_plural_keywords_match(self):
+        """Plural forms hit their singular keywords"""
+        analysis = self.analyzer.analyze_content(
+            "Add buttons and forms with modals, animations, menus and dialogs"
+        )
+        self.assertEqual(analysis["ui_components"], ["button", "form", "modal", "dialog", "menu"])
+        self.assertEqual(analysis["features"], ["animation"])
+        self.assertEqual(analysis["complexity"], "moderate")
+
+    def test_es_plurals_match(self):
+        """'-es' plurals are stripped as well as '-s' ones"""
+        analysis = self.analyzer.analyze_content("Write unit tests for the build processes")
+        self.assertEqual(analysis["complexity"], "complex")
+
+    def test_substrings_do_not_match(self):
+        """Keywords inside longer words are not reported"""
+        analysis = self.analyzer.analyze_content("Need access to the json api in this space")
+        self.assertEqual(analysis["technologies"], [])
+        self.assertEqual(analysis["complexity"], "simple")
+
+    def test_phrases_match(self):
+        """Multi-word keywords are matched as phrases"""
+        analysis = self.analyzer.analyze_content("Persist tasks in local storage")
+        self.assertEqual(analysis["storage_needs"], ["local storage"])
+
+    def test_mock_issue_complexity(self):
+        """Mock issue #47 mentions frameworks, so it is rated complex"""
+        issue = self.analyzer.get_mock_issue_data(47)
+        analysis = self.analyzer.analyze_content(f"{issue['title']}\n{issue['body']}")
+        self.assertEqual(analysis["complexity"], "complex")
+        self.assertEqual(analysis["technologies"], ["html", "css", "javascript", "vanilla"])
+
+class FakeResponse:
+    """Minimal stand-in for a requests.Response"""
+
+    def __init__(self, status_code, body=None, etag=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+class TestAnalysisCache(unittest.TestCase):
+    """Test cases for the on-disk ETag cache"""
+
+    ISSUE = {"title": "Form validation", "body": "- must validate input", "labels": [{"name": "frontend"}]}
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = Path(self.temp_dir.name) / "frontend_analyzer" / "issues.json"
+        self.requests = []
+        patches = [
+            mock.patch.object(frontend_analyzer, "ANALYSIS_CACHE_FILE", self.cache_file),
+            mock.patch.object(frontend_analyzer.GITHUB_SESSION, "get", self.fake_get),
+            mock.patch.dict(os.environ, {"GITHUB_TOKEN": "token", "GITHUB_REPOSITORY": "owner/repo"}),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def fake_get(self, url, headers):
+        """GitHub double: 304 for the current ETag, otherwise the full issue"""
+        self.requests.append((url, headers.get("If-None-Match")))
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, dict(self.ISSUE, number=5), '"v1"')
+
+    def write_cache(self, issues, version=None):
+        self.cache_file.parent.mkdir(parents=True)
+        if version is None:
+            version = frontend_analyzer.ANALYSIS_CACHE_VERSION
+        self.cache_file.write_text(json.dumps({"version": version, "issues": issues}), encoding="utf-8")
+
+    def test_not_modified_round_trip(self):
+        """A second run sends the stored ETag and reuses the cached result on 304"""
+        first = FrontendAnalyzer().analyze_issue(5)
+        second_analyzer = FrontendAnalyzer()
+        with mock.patch.object(second_analyzer, "analyze_content") as analyze_content:
+            second = second_analyzer.analyze_issue(5)
+        analyze_content.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual([etag for _, etag in self.requests], [None, '"v1"'])
+        self.assertEqual(self.requests[0][0], "https://api.github.com/repos/owner/repo/issues/5")
+        cache = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        self.assertEqual(list(cache["issues"]), ["owner/repo#5"])
+        self.assertEqual([p.name for p in self.cache_file.parent.iterdir()], ["issues.json"])
+
+    def test_stale_version_is_ignored(self):
+        """A cache written by another ANALYSIS_CACHE_VERSION is not used"""
+        entry = {"etag": '"v1"', "issue": self.ISSUE, "result": {"stale": True}}
+        self.write_cache({"owner/repo#5": entry}, version=frontend_analyzer.ANALYSIS_CACHE_VERSION - 1)
+        result = FrontendAnalyzer().analyze_issue(5)
+        self.assertNotIn("stale", result)
+        self.assertEqual(self.requests[0][1], None)
+
+    def test_malformed_entries_are_dropped(self):
+        """Entries missing fields or of the wrong type are discarded on load"""
+        good = {"etag": '"v1"', "issue": self.ISSUE, "result": {"cached": True}}
+        self.write_cache({
+            "owner/repo#1": "not a dict",
+            "owner/repo#2": {"etag": '"v1"', "issue": self.ISSUE},
+            "owner/repo#3": {"etag": 7, "issue": self.ISSUE, "result": {}},
+            "owner/repo#4": good,
+        })
+        self.assertEqual(FrontendAnalyzer()._cache, {"owner/repo#4": good})
+
+    def test_malformed_issues_table_is_ignored(self):
+        """A non-dict issues table loads as an empty cache"""
+        self.write_cache(["owner/repo#5"])
+        self.assertEqual(FrontendAnalyzer()._cache, {})
+
+    def test_entries_are_isolated_per_repository(self):
+        """The same issue number in another repository is fetched, not served from the cache"""
+        FrontendAnalyzer().analyze_issue(5)
+        with mock.patch.dict(os.environ, {"GITHUB_REPOSITORY": "other/repo"}):
+            FrontendAnalyzer().analyze_issue(5)
+        self.assertEqual(self.requests[1], ("https://api.github.com/repos/other/repo/issues/5", None))
+        cache = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        self.assertEqual(sorted(cache["issues"]), ["other/repo#5", "owner/repo#5"])
+
+if __name__ == "__main__":
+    unittest.main()
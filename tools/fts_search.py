@@ -11,26 +11,30 @@ Query content index:
 - tokens fallback: AND all terms present
 """
 import sqlite3, argparse, sys
+from pathlib import Path
 def main():
   ap = argparse.ArgumentParser()
   ap.add_argument("--state", required=True)
   ap.add_argument("--query", required=True)
   args = ap.parse_args()
   db = f"{args.state}/techula_index.db"
-  conn = sqlite3.connect(db)
+  # read-only: no write locks/journal, and never creates an empty db on a bad --state
+  conn = sqlite3.connect(f"{Path(db).absolute().as_uri()}?mode=ro", uri=True)
+  # serve FTS segments from mmap and a 64 MB page cache instead of per-page read()s
+  conn.executescript("PRAGMA mmap_size=268435456; PRAGMA cache_size=-65536; PRAGMA temp_store=MEMORY;")
+  # user_version picks the FTS5 or tokens path once, without a speculative query
   ver = conn.execute("PRAGMA user_version").fetchone()[0]
   if ver==1:
     sql = "SELECT path FROM content_fts WHERE content_fts MATCH ? LIMIT 200"
-    rows = conn.execute(sql, (args.query,)).fetchall()
-    for (p,) in rows: print(p)
+    # stream hits straight from the cursor instead of buffering with fetchall()
+    for (p,) in conn.execute(sql, (args.query,)): print(p)
   else:
     terms = [t for t in args.query.split() if t]
     if not terms: sys.exit(0)
     # naive intersection
     sets = []
     for t in terms:
-      rows = conn.execute("SELECT path FROM content_tokens WHERE term=?", (t.lower(),)).fetchall()
-      sets.append(set(p for (p,) in rows))
+      sets.append({p for (p,) in conn.execute("SELECT path FROM content_tokens WHERE term=?", (t.lower(),))})
     res = set.intersection(*sets) if sets else set()
     for p in list(sorted(res))[:200]: print(p)
 if __name__ == "__main__":